@@ -3,11 +3,64 @@ Eco-Prompt Coach Calculation Engine
 Complete environmental impact calculator for AI queries
 """
 
+from ._data import provider_lookup_error
 from .energy import EnergyCalculator
 from .water import WaterCalculator
 from .carbon import CarbonCalculator
 from .conversions import ConversionCalculator
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+
+# Eco score weights for (energy, water, carbon); equal weighting for simplicity.
+# Kept at module scope so a configurable profile can swap them in later.
+_ECO_WEIGHTS = (0.33, 0.33, 0.34)
+
+# Candidate models compared when suggesting a more eco-efficient alternative
+SUGGESTION_MODELS = (
+    "gpt-4.1-nano", "llama-3.2-1b", "gemini-2.0-flash", "gemini-1.5-flash",
+    "gpt-4o-mini", "gpt-4o", "gemini-1.5-pro", "claude-3.7-sonnet"
+)
+
+
+class ModelImpact:
+    """Compact per-model record used while scoring a comparison."""
+    __slots__ = (
+        "model_id", "model_name", "provider", "energy_wh", "water_ml",
+        "carbon_gco2e", "conversions", "eco_score"
+    )
+
+    def __init__(
+        self,
+        model_id: str,
+        model_name: str,
+        provider: str,
+        energy_wh: float,
+        water_ml: float,
+        carbon_gco2e: float,
+        conversions: Dict,
+        eco_score: float = 0.0
+    ):
+        self.model_id = model_id
+        self.model_name = model_name
+        self.provider = provider
+        self.energy_wh = energy_wh
+        self.water_ml = water_ml
+        self.carbon_gco2e = carbon_gco2e
+        self.conversions = conversions
+        self.eco_score = eco_score
+
+    def to_dict(self) -> Dict:
+        """Convert to the comparison entry dict returned by the API."""
+        return {
+            "model_id": self.model_id,
+            "model_name": self.model_name,
+            "provider": self.provider,
+            "energy_wh": self.energy_wh,
+            "water_ml": self.water_ml,
+            "carbon_gco2e": self.carbon_gco2e,
+            "conversions": self.conversions,
+            "eco_score": self.eco_score
+        }
 
 
 class EcoImpactCalculator:
@@ -17,10 +70,10 @@ class EcoImpactCalculator:
     """
 
     def __init__(self, data_dir: str = "../data"):
-        """Initialize all sub-calculators."""
+        """Initialize all sub-calculators, sharing a single EnergyCalculator."""
         self.energy_calc = EnergyCalculator(data_dir)
-        self.water_calc = WaterCalculator(data_dir)
-        self.carbon_calc = CarbonCalculator(data_dir)
+        self.water_calc = WaterCalculator(data_dir, energy_calculator=self.energy_calc)
+        self.carbon_calc = CarbonCalculator(data_dir, energy_calculator=self.energy_calc)
         self.conversion_calc = ConversionCalculator(data_dir)
 
     def calculate_complete_impact(
@@ -71,7 +124,7 @@ class EcoImpactCalculator:
         )
 
         # Get model info
-        model = next((m for m in self.energy_calc.models["models"] if m["model_id"] == model_id), None)
+        model = self.energy_calc.models_by_id.get(model_id)
 
         return {
             "model": {
@@ -115,125 +168,242 @@ class EcoImpactCalculator:
         self,
         model_ids: list,
         input_tokens: int,
-        output_tokens: int
+        output_tokens: int,
+        precomputed: Dict = None
     ) -> Dict:
         """
         Compare multiple models across all environmental metrics.
 
+        Args:
+            model_ids: Model identifiers to compare
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            precomputed: Optional {model_id: impact} of results from
+                calculate_complete_impact for the same token counts, reused
+                instead of recalculating
+
         Returns:
             Complete comparison with recommendations
         """
+        results, best_model, worst_model = self._score_models(
+            model_ids, input_tokens, output_tokens, precomputed
+        )
+        if best_model is None:
+            return {"comparison": results, "recommendation": None}
+
+        return {
+            "comparison": [r.to_dict() if isinstance(r, ModelImpact) else r for r in results],
+            "recommendation": best_model.model_id,
+            "best": {
+                "model": best_model.model_id,
+                "eco_score": best_model.eco_score,
+                "energy_wh": best_model.energy_wh,
+                "water_ml": best_model.water_ml,
+                "carbon_gco2e": best_model.carbon_gco2e
+            },
+            "worst": {
+                "model": worst_model.model_id,
+                "eco_score": worst_model.eco_score,
+                "energy_wh": worst_model.energy_wh,
+                "water_ml": worst_model.water_ml,
+                "carbon_gco2e": worst_model.carbon_gco2e
+            },
+            "potential_savings": {
+                "energy_wh": worst_model.energy_wh - best_model.energy_wh,
+                "water_ml": worst_model.water_ml - best_model.water_ml,
+                "carbon_gco2e": worst_model.carbon_gco2e - best_model.carbon_gco2e,
+                "percentage": ((worst_model.eco_score - best_model.eco_score) / worst_model.eco_score) * 100
+            }
+        }
+
+    def compare_models_complete_columns(
+        self,
+        model_ids: list,
+        input_tokens: int,
+        output_tokens: int,
+        precomputed: Dict = None
+    ) -> Dict[str, list]:
+        """
+        Compare multiple models and return the results column-wise.
+
+        Suited to tables and plotting: each key maps to a list with one entry
+        per requested model, in request order. Metric columns hold None for
+        models that could not be evaluated, whose message is in "error".
+
+        Returns:
+            Dictionary of columns: model_id, model_name, provider, energy_wh,
+            water_ml, carbon_gco2e, eco_score, error
+        """
+        results, _, _ = self._score_models(model_ids, input_tokens, output_tokens, precomputed)
+
+        columns = {
+            "model_id": [],
+            "model_name": [],
+            "provider": [],
+            "energy_wh": [],
+            "water_ml": [],
+            "carbon_gco2e": [],
+            "eco_score": [],
+            "error": []
+        }
+        for r in results:
+            if isinstance(r, ModelImpact):
+                columns["model_id"].append(r.model_id)
+                columns["model_name"].append(r.model_name)
+                columns["provider"].append(r.provider)
+                columns["energy_wh"].append(r.energy_wh)
+                columns["water_ml"].append(r.water_ml)
+                columns["carbon_gco2e"].append(r.carbon_gco2e)
+                columns["eco_score"].append(r.eco_score)
+                columns["error"].append(None)
+            else:
+                for key, values in columns.items():
+                    values.append(r.get(key))
+
+        return columns
+
+    def _score_models(
+        self,
+        model_ids: list,
+        input_tokens: int,
+        output_tokens: int,
+        precomputed: Dict = None
+    ) -> Tuple[List, Optional[ModelImpact], Optional[ModelImpact]]:
+        """
+        Evaluate and eco-score each model.
+
+        Returns:
+            Tuple of (results, best, worst) where results holds a ModelImpact
+            or an error dict per requested model, and best/worst are None when
+            no model could be evaluated
+        """
+        precomputed = precomputed or {}
         results = []
 
+        models_by_id = self.energy_calc.models_by_id
+        model_to_provider = self.energy_calc.model_to_provider
+
         for model_id in model_ids:
-            try:
-                impact = self.calculate_complete_impact(model_id, input_tokens, output_tokens)
+            # Unknown models and providers are reported in place rather than raised
+            if model_id not in model_to_provider:
                 results.append({
                     "model_id": model_id,
-                    "model_name": impact["model"]["name"],
-                    "provider": impact["model"]["provider"],
-                    "energy_wh": impact["environmental_impact"]["energy"]["wh"],
-                    "water_ml": impact["environmental_impact"]["water"]["ml"],
-                    "carbon_gco2e": impact["environmental_impact"]["carbon"]["gco2e"],
-                    "conversions": impact["summary"]
-                })
-            except Exception as e:
-                results.append({
-                    "model_id": model_id,
-                    "error": str(e)
+                    "error": provider_lookup_error(models_by_id, model_id)
                 })
+                continue
 
-        # Find best model overall (weighted by all factors)
-        valid_results = [r for r in results if "error" not in r]
-        if valid_results:
-            # Normalize scores (0-1 scale, lower is better)
-            max_energy = max(r["energy_wh"] for r in valid_results)
-            max_water = max(r["water_ml"] for r in valid_results)
-            max_carbon = max(r["carbon_gco2e"] for r in valid_results)
-
-            for r in valid_results:
-                # Equal weighting for simplicity
-                r["eco_score"] = (
-                    (r["energy_wh"] / max_energy) * 0.33 +
-                    (r["water_ml"] / max_water) * 0.33 +
-                    (r["carbon_gco2e"] / max_carbon) * 0.34
-                )
-
-            # Sort by eco score (lower is better)
-            valid_results.sort(key=lambda x: x["eco_score"])
-
-            best_model = valid_results[0]
-            worst_model = valid_results[-1]
-
-            return {
-                "comparison": results,
-                "recommendation": best_model["model_id"],
-                "best": {
-                    "model": best_model["model_id"],
-                    "eco_score": best_model["eco_score"],
-                    "energy_wh": best_model["energy_wh"],
-                    "water_ml": best_model["water_ml"],
-                    "carbon_gco2e": best_model["carbon_gco2e"]
-                },
-                "worst": {
-                    "model": worst_model["model_id"],
-                    "eco_score": worst_model["eco_score"],
-                    "energy_wh": worst_model["energy_wh"],
-                    "water_ml": worst_model["water_ml"],
-                    "carbon_gco2e": worst_model["carbon_gco2e"]
-                },
-                "potential_savings": {
-                    "energy_wh": worst_model["energy_wh"] - best_model["energy_wh"],
-                    "water_ml": worst_model["water_ml"] - best_model["water_ml"],
-                    "carbon_gco2e": worst_model["carbon_gco2e"] - best_model["carbon_gco2e"],
-                    "percentage": ((worst_model["eco_score"] - best_model["eco_score"]) / worst_model["eco_score"]) * 100
-                }
-            }
+            impact = precomputed.get(model_id)
+            if impact is None:
+                impact = self.calculate_complete_impact(model_id, input_tokens, output_tokens)
+            results.append(ModelImpact(
+                model_id=model_id,
+                model_name=impact["model"]["name"],
+                provider=impact["model"]["provider"],
+                energy_wh=impact["environmental_impact"]["energy"]["wh"],
+                water_ml=impact["environmental_impact"]["water"]["ml"],
+                carbon_gco2e=impact["environmental_impact"]["carbon"]["gco2e"],
+                conversions=impact["summary"]
+            ))
 
-        return {"comparison": results, "recommendation": None}
+        # Find best model overall (weighted by all factors)
+        valid_results = [r for r in results if isinstance(r, ModelImpact)]
+        if not valid_results:
+            return results, None, None
+
+        # Track all three maxima in a single pass, then normalize each
+        # metric by its max (0-1 scale, lower is better)
+        max_energy = max_water = max_carbon = 0.0
+        for r in valid_results:
+            if r.energy_wh > max_energy:
+                max_energy = r.energy_wh
+            if r.water_ml > max_water:
+                max_water = r.water_ml
+            if r.carbon_gco2e > max_carbon:
+                max_carbon = r.carbon_gco2e
+
+        energy_weight, water_weight, carbon_weight = _ECO_WEIGHTS
+        scores = [
+            (r.energy_wh / max_energy) * energy_weight +
+            (r.water_ml / max_water) * water_weight +
+            (r.carbon_gco2e / max_carbon) * carbon_weight
+            for r in valid_results
+        ]
+        for r, score in zip(valid_results, scores):
+            r.eco_score = score
+
+        # Pick best/worst by eco score (lower is better) without sorting;
+        # ties resolve as a stable sort would (first best, last worst)
+        indices = range(len(scores))
+        best_model = valid_results[min(indices, key=scores.__getitem__)]
+        worst_model = valid_results[max(reversed(indices), key=scores.__getitem__)]
+
+        return results, best_model, worst_model
 
     def get_optimization_suggestions(
         self,
         model_id: str,
         input_tokens: int,
         output_tokens: int,
-        prompt_text: str = None
+        prompt_text: str = None,
+        max_suggestions: int = None
     ) -> Dict:
         """
         Generate optimization suggestions to reduce environmental impact.
 
+        Args:
+            model_id: Model identifier (e.g., "gpt-4o")
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            prompt_text: Optional prompt text for token estimation
+            max_suggestions: Optional cap on the number of suggestions; work for
+                suggestions past the cap is skipped
+
         Returns:
             List of actionable suggestions with estimated savings
         """
         current_impact = self.calculate_complete_impact(model_id, input_tokens, output_tokens, prompt_text)
+        impact = current_impact["environmental_impact"]
+        current_energy_wh = impact["energy"]["wh"]
+        current_water_ml = impact["water"]["ml"]
+        current_carbon_gco2e = impact["carbon"]["gco2e"]
         suggestions = []
 
+        def has_room() -> bool:
+            return max_suggestions is None or len(suggestions) < max_suggestions
+
         # Suggestion 1: Model selection
         # Compare with more efficient models in same size class or smaller
-        all_models = ["gpt-4.1-nano", "llama-3.2-1b", "gemini-2.0-flash", "gemini-1.5-flash", "gpt-4o-mini", "gpt-4o", "gemini-1.5-pro", "claude-3.7-sonnet"]
-        comparison = self.compare_models_complete(all_models, input_tokens, output_tokens)
-
-        if comparison["recommendation"] != model_id:
-            best = comparison["best"]
-            savings = comparison["potential_savings"]
-
-            suggestions.append({
-                "type": "model_selection",
-                "title": f"Switch to {best['model']}",
-                "description": f"This model is more eco-efficient for similar tasks",
-                "savings": {
-                    "energy_wh": savings["energy_wh"],
-                    "water_ml": savings["water_ml"],
-                    "carbon_gco2e": savings["carbon_gco2e"],
-                    "percentage": savings["percentage"]
-                },
-                "action": f"Use {best['model']} instead of {model_id}"
-            })
+        if has_room():
+            # Reuse the current model's impact unless token estimation changed the counts
+            tokens = current_impact["tokens"]
+            precomputed = {}
+            if tokens["input"] == input_tokens and tokens["output"] == output_tokens:
+                precomputed[model_id] = current_impact
+            comparison = self.compare_models_complete(
+                SUGGESTION_MODELS, input_tokens, output_tokens, precomputed=precomputed
+            )
+
+            if comparison["recommendation"] != model_id:
+                best = comparison["best"]
+                savings = comparison["potential_savings"]
+
+                suggestions.append({
+                    "type": "model_selection",
+                    "title": f"Switch to {best['model']}",
+                    "description": f"This model is more eco-efficient for similar tasks",
+                    "savings": {
+                        "energy_wh": savings["energy_wh"],
+                        "water_ml": savings["water_ml"],
+                        "carbon_gco2e": savings["carbon_gco2e"],
+                        "percentage": savings["percentage"]
+                    },
+                    "action": f"Use {best['model']} instead of {model_id}"
+                })
 
         # Suggestion 2: Reduce output length
-        if output_tokens > 300:
-            reduced_impact = self.calculate_complete_impact(model_id, input_tokens, 300)
-            energy_saved = current_impact["environmental_impact"]["energy"]["wh"] - reduced_impact["environmental_impact"]["energy"]["wh"]
+        if output_tokens > 300 and has_room():
+            reduced = self.calculate_complete_impact(model_id, input_tokens, 300)["environmental_impact"]
+            energy_saved = current_energy_wh - reduced["energy"]["wh"]
 
             suggestions.append({
                 "type": "output_length",
@@ -241,21 +411,21 @@ class EcoImpactCalculator:
                 "description": "Add 'Answer in 300 words or less' to your prompt",
                 "savings": {
                     "energy_wh": energy_saved,
-                    "water_ml": current_impact["environmental_impact"]["water"]["ml"] - reduced_impact["environmental_impact"]["water"]["ml"],
-                    "carbon_gco2e": current_impact["environmental_impact"]["carbon"]["gco2e"] - reduced_impact["environmental_impact"]["carbon"]["gco2e"],
-                    "percentage": (energy_saved / current_impact["environmental_impact"]["energy"]["wh"]) * 100
+                    "water_ml": current_water_ml - reduced["water"]["ml"],
+                    "carbon_gco2e": current_carbon_gco2e - reduced["carbon"]["gco2e"],
+                    "percentage": (energy_saved / current_energy_wh) * 100
                 },
                 "action": "Limit output tokens to 300"
             })
 
         # Suggestion 3: Prompt efficiency
-        if prompt_text and input_tokens > 200:
+        if prompt_text and input_tokens > 200 and has_room():
             suggestions.append({
                 "type": "prompt_efficiency",
                 "title": "Simplify your prompt",
                 "description": "Remove unnecessary words and context",
                 "savings": {
-                    "energy_wh": current_impact["environmental_impact"]["energy"]["wh"] * 0.15,  # Estimate 15% savings
+                    "energy_wh": current_energy_wh * 0.15,  # Estimate 15% savings
                     "percentage": 15
                 },
                 "action": "Review and shorten your prompt"
@@ -0,0 +1,61 @@
+"""
+Shared Data Module
+Loads the JSON data files, maps model hosts to infrastructure providers and
+holds small helpers shared by the calculation modules
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+
+# Maps a model's "host" field to its key in infrastructure.json
+PROVIDER_MAP = {
+    "Microsoft Azure": "microsoft_azure",
+    "AWS": "aws",
+    "DeepSeek": "deepseek",
+    "Google Cloud": "google_cloud"
+}
+
+
+@lru_cache(maxsize=None)
+def load_json(path: str) -> Dict:
+    """
+    Load a JSON data file once per process.
+
+    The returned dict is shared by every calculator instance loading the same
+    path, so callers must copy it before making any changes.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def provider_lookup_error(models_by_id: Dict, model_id: str) -> str:
+    """Describe why a model has no provider multipliers."""
+    model = models_by_id.get(model_id)
+    if not model:
+        return f"Model {model_id} not found"
+    return f"Unknown provider: {model['host']}"
+
+
+def best_and_worst(records: Sequence, key: Callable[[Any], float]) -> Tuple[Any, float, float]:
+    """
+    Find the lowest-valued record and the value range in a single pass.
+
+    Args:
+        records: Non-empty sequence of per-model records
+        key: Function returning the metric to compare for a record
+
+    Returns:
+        Tuple of (best_record, best_value, worst_value); ties keep the
+        earliest record
+    """
+    best_record = records[0]
+    best = worst = key(best_record)
+    for record in records[1:]:
+        value = key(record)
+        if value < best:
+            best_record, best = record, value
+        elif value > worst:
+            worst = value
+    return best_record, best, worst
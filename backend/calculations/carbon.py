@@ -5,42 +5,123 @@ Based on "How Hungry is AI?" paper methodology
 Formula: Carbon (kgCO2e) = Equery × CIF
 """
 
-import json
+from collections.abc import Iterable
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple, Union
+from ._data import best_and_worst, provider_lookup_error
 from .energy import EnergyCalculator
 
 
+def _carbon_kernel(energy_wh: float, cif: float) -> Tuple[float, float, float]:
+    """
+    Core per-query carbon arithmetic, kept free of dict handling.
+
+    Returns:
+        Tuple of (energy_kwh, carbon_kgco2e, carbon_gco2e)
+    """
+    # Wh × kgCO2e/kWh is already gCO2e, so no kWh round trip is needed
+    carbon_gco2e = energy_wh * cif
+    return energy_wh / 1000, carbon_gco2e / 1000, carbon_gco2e
+
+
+def _carbon_kernel_batch(energy_wh: List[float], cif: List[float]) -> Tuple[List[float], List[float]]:
+    """
+    Batched form of _carbon_kernel over parallel lists of energy and CIF.
+
+    Only the carbon columns are produced; callers already hold the energy.
+
+    Returns:
+        Tuple of (carbon_kgco2e, carbon_gco2e) lists
+    """
+    carbon_gco2e = [e * c for e, c in zip(energy_wh, cif)]
+    return [c / 1000 for c in carbon_gco2e], carbon_gco2e
+
+
+def _project_annual(
+    daily_queries: int,
+    carbon_per_query_gco2e: float,
+    growth_rate: float
+) -> Tuple[float, float, float]:
+    """
+    Project a year of queries and carbon for one scenario.
+
+    Args:
+        daily_queries: Number of queries per day at the start of the year
+        carbon_per_query_gco2e: Carbon per query in grams
+        growth_rate: Monthly growth rate (e.g., 0.20 for 20%)
+
+    Returns:
+        Tuple of (annual_queries, annual_carbon_gco2e, daily_queries_end)
+    """
+    # Monthly volumes form a geometric series: the daily rate grows by
+    # (1 + growth_rate) each month over 12 months of 30 days (simplified)
+    ratio = 1 + growth_rate
+    months = 12
+    days_in_month = 30
+
+    if ratio == 1:
+        # No growth: flat volume, kept in integer arithmetic for integer inputs
+        annual_queries = daily_queries * days_in_month * months
+        return annual_queries, annual_queries * carbon_per_query_gco2e, daily_queries
+
+    growth_factor = (ratio ** months - 1) / (ratio - 1)
+    annual_queries = daily_queries * days_in_month * growth_factor
+    annual_carbon_gco2e = annual_queries * carbon_per_query_gco2e
+
+    # Growth is not applied after the last month
+    current_daily = daily_queries * ratio ** (months - 1)
+
+    return annual_queries, annual_carbon_gco2e, current_daily
+
+
+def _broadcast(*values: Union[float, Iterable[float]]) -> List[List[float]]:
+    """
+    Expand scalars to lists matching the length of any iterable arguments.
+
+    Iterable arguments of differing lengths raise ValueError.
+
+    Args:
+        values: Single numbers or non-string iterables of numbers
+
+    Returns:
+        One list per argument, all of the same length
+    """
+    # Materialize non-string iterables (ranges, generators, arrays) up front
+    values = [list(v) if isinstance(v, Iterable) and not isinstance(v, str) else v for v in values]
+    lengths = {len(v) for v in values if isinstance(v, list)}
+    if len(lengths) > 1:
+        raise ValueError("All sequence arguments must have the same length")
+    size = lengths.pop() if lengths else 1
+
+    return [v if isinstance(v, list) else [v] * size for v in values]
+
+
 class CarbonCalculator:
-    def __init__(self, data_dir: str = "../data"):
-        """Initialize the carbon calculator."""
+    __slots__ = ("data_dir", "energy_calculator", "infrastructure", "_model_to_provider")
+
+    def __init__(self, data_dir: str = "../data", energy_calculator: EnergyCalculator = None):
+        """
+        Initialize the carbon calculator.
+
+        Args:
+            data_dir: Directory containing the JSON data files
+            energy_calculator: Optional shared EnergyCalculator; its loaded
+                models and infrastructure data are reused instead of re-reading JSON
+        """
         self.data_dir = Path(data_dir)
-        self.energy_calculator = EnergyCalculator(data_dir)
-        self.infrastructure = self._load_infrastructure()
+        self.energy_calculator = energy_calculator or EnergyCalculator(data_dir)
+        self.infrastructure = self.energy_calculator.infrastructure
 
-    def _load_infrastructure(self) -> Dict:
-        """Load infrastructure multipliers from JSON."""
-        with open(self.data_dir / "infrastructure.json", "r") as f:
-            return json.load(f)
+        # The energy calculator already indexes provider multipliers by model
+        self._model_to_provider = self.energy_calculator.model_to_provider
 
     def _get_provider_multipliers(self, model_id: str) -> Dict:
         """Get CIF for a model's provider."""
-        model = next((m for m in self.energy_calculator.models["models"] if m["model_id"] == model_id), None)
-        if not model:
-            raise ValueError(f"Model {model_id} not found")
-
-        provider_map = {
-            "Microsoft Azure": "microsoft_azure",
-            "AWS": "aws",
-            "DeepSeek": "deepseek",
-            "Google Cloud": "google_cloud"
-        }
-
-        provider_key = provider_map.get(model["host"])
-        if not provider_key:
-            raise ValueError(f"Unknown provider: {model['host']}")
-
-        return self.infrastructure["providers"][provider_key]
+        provider = self._model_to_provider.get(model_id)
+        if provider is None:
+            raise ValueError(provider_lookup_error(self.energy_calculator.models_by_id, model_id))
+        return provider
 
     def calculate_carbon(
         self,
@@ -74,17 +155,13 @@ class CarbonCalculator:
                 model_id, input_tokens, output_tokens
             )
             energy_wh = energy_data["energy_wh"]
-            energy_kwh = energy_data["energy_kwh"]
-        else:
-            energy_kwh = energy_wh / 1000
 
         # Get provider multipliers
         provider = self._get_provider_multipliers(model_id)
         cif = provider["cif_kgco2e_per_kwh"]
 
         # Calculate carbon emissions
-        carbon_kgco2e = energy_kwh * cif
-        carbon_gco2e = carbon_kgco2e * 1000
+        energy_kwh, carbon_kgco2e, carbon_gco2e = _carbon_kernel(energy_wh, cif)
 
         return {
             "carbon_gco2e": carbon_gco2e,
@@ -112,36 +189,51 @@ class CarbonCalculator:
             Dictionary with comparison data and recommendation
         """
         results = []
+        pending = []
 
+        # Resolve energy and provider per model once; carbon is then
+        # computed for all valid models in a single batch. Models without
+        # provider multipliers are reported in place rather than raised.
         for model_id in model_ids:
-            try:
-                carbon_data = self.calculate_carbon(model_id, input_tokens, output_tokens)
-                model = next((m for m in self.energy_calculator.models["models"] if m["model_id"] == model_id), None)
-
-                results.append({
-                    "model_id": model_id,
-                    "model_name": model["name"],
-                    "carbon_gco2e": carbon_data["carbon_gco2e"],
-                    "carbon_kgco2e": carbon_data["carbon_kgco2e"],
-                    "provider": carbon_data["provider"]
-                })
-            except Exception as e:
+            provider = self._model_to_provider.get(model_id)
+            if provider is None:
                 results.append({
                     "model_id": model_id,
-                    "error": str(e)
+                    "error": provider_lookup_error(self.energy_calculator.models_by_id, model_id)
                 })
+                continue
+
+            energy_data = self.energy_calculator.calculate_energy(
+                model_id, input_tokens, output_tokens
+            )
+            pending.append((len(results), model_id, energy_data["energy_wh"], provider))
+            results.append(None)
+
+        carbon_kgco2e, carbon_gco2e = _carbon_kernel_batch(
+            [energy_wh for _, _, energy_wh, _ in pending],
+            [provider["cif_kgco2e_per_kwh"] for _, _, _, provider in pending]
+        )
+
+        for (index, model_id, _, provider), kgco2e, gco2e in zip(pending, carbon_kgco2e, carbon_gco2e):
+            results[index] = {
+                "model_id": model_id,
+                "model_name": self.energy_calculator.models_by_id[model_id]["name"],
+                "carbon_gco2e": gco2e,
+                "carbon_kgco2e": kgco2e,
+                "provider": provider["name"]
+            }
 
         # Find most efficient model
         valid_results = [r for r in results if "error" not in r]
         if valid_results:
-            most_efficient = min(valid_results, key=lambda x: x["carbon_gco2e"])
+            most_efficient, best, worst = best_and_worst(valid_results, itemgetter("carbon_gco2e"))
 
             return {
                 "comparison": results,
                 "recommendation": most_efficient["model_id"],
                 "savings": {
-                    "best_carbon_gco2e": most_efficient["carbon_gco2e"],
-                    "worst_carbon_gco2e": max(valid_results, key=lambda x: x["carbon_gco2e"])["carbon_gco2e"]
+                    "best_carbon_gco2e": best,
+                    "worst_carbon_gco2e": worst
                 }
             }
 
@@ -164,39 +256,64 @@ class CarbonCalculator:
         Returns:
             Dictionary with annual projections
         """
-        annual_queries = 0
-        annual_carbon_gco2e = 0
-
-        current_daily = daily_queries
-
-        for month in range(12):
-            # Queries this month
-            days_in_month = 30  # Simplified
-            monthly_queries = current_daily * days_in_month
-
-            # Carbon this month
-            monthly_carbon = monthly_queries * carbon_per_query_gco2e
-
-            annual_queries += monthly_queries
-            annual_carbon_gco2e += monthly_carbon
-
-            # Apply growth for next month
-            if month < 11:  # Don't grow after the last month
-                current_daily *= (1 + growth_rate)
-
-        annual_carbon_kgco2e = annual_carbon_gco2e / 1000
-        annual_carbon_tco2e = annual_carbon_kgco2e / 1000
+        annual_queries, annual_carbon_gco2e, current_daily = _project_annual(
+            daily_queries, carbon_per_query_gco2e, growth_rate
+        )
 
         return {
             "annual_queries": int(annual_queries),
             "annual_carbon_gco2e": annual_carbon_gco2e,
-            "annual_carbon_kgco2e": annual_carbon_kgco2e,
-            "annual_carbon_tons": annual_carbon_tco2e,
+            "annual_carbon_kgco2e": annual_carbon_gco2e / 1000,
+            "annual_carbon_tons": annual_carbon_gco2e / 1_000_000,
             "daily_queries_start": daily_queries,
             "daily_queries_end": int(current_daily),
             "growth_rate": growth_rate
         }
 
+    def calculate_annual_impact_batch(
+        self,
+        daily_queries: Union[int, Iterable[int]],
+        carbon_per_query_gco2e: Union[float, Iterable[float]],
+        growth_rate: Union[float, Iterable[float]] = 0.0
+    ) -> Dict:
+        """
+        Calculate annual carbon impact for many scenarios at once.
+
+        Each argument may be a single number or an iterable such as a list or
+        range; single numbers are applied to every scenario and iterables must
+        all have the same length.
+
+        Args:
+            daily_queries: Number(s) of queries per day
+            carbon_per_query_gco2e: Carbon per query in gCO2e
+            growth_rate: Monthly growth rate(s) (e.g., 0.20 for 20%)
+
+        Returns:
+            Dictionary with the same keys as calculate_annual_impact, each
+            holding a list with one value per scenario
+        """
+        daily, carbon, growth = _broadcast(daily_queries, carbon_per_query_gco2e, growth_rate)
+
+        result = {
+            "annual_queries": [],
+            "annual_carbon_gco2e": [],
+            "annual_carbon_kgco2e": [],
+            "annual_carbon_tons": [],
+            "daily_queries_start": daily,
+            "daily_queries_end": [],
+            "growth_rate": growth
+        }
+
+        for d, c, g in zip(daily, carbon, growth):
+            annual_queries, annual_carbon_gco2e, current_daily = _project_annual(d, c, g)
+            result["annual_queries"].append(int(annual_queries))
+            result["annual_carbon_gco2e"].append(annual_carbon_gco2e)
+            result["annual_carbon_kgco2e"].append(annual_carbon_gco2e / 1000)
+            result["annual_carbon_tons"].append(annual_carbon_gco2e / 1_000_000)
+            result["daily_queries_end"].append(int(current_daily))
+
+        return result
+
 
 # Example usage
 if __name__ == "__main__":
@@ -3,21 +3,128 @@ Relatable Conversions Module
 Converts energy, water, and carbon metrics into understandable comparisons
 """
 
-import json
+from bisect import bisect_right
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List
+try:
+    from ._data import load_json
+except ImportError:  # run directly as a script (see example usage below)
+    from _data import load_json
+
+
+# Layout used by ConversionCalculator.format_for_display
+_DISPLAY_TEMPLATE = (
+    "🌍 ENVIRONMENTAL IMPACT\n"
+    "\n"
+    "⚡ Energy: {:.2f} Wh\n"
+    "   = {}\n"
+    "\n"
+    "💧 Water: {:.2f} mL\n"
+    "   = {}\n"
+    "\n"
+    "🌱 Carbon: {:.2f} gCO2e\n"
+    "   = {}"
+)
+
+
+# Primary (most relatable) comparison per metric as step tables:
+# values below THRESHOLDS[i] map to PRIMARY[i], anything larger to PRIMARY[-1]
+_ENERGY_THRESHOLDS = (1, 5, 20)
+_ENERGY_PRIMARY = ("led_lightbulb", "smartphone_charge", "laptop_runtime", "coffee_cup")
+
+_WATER_THRESHOLDS = (10, 100, 500)
+_WATER_PRIMARY = ("water_drops", "daily_drinking_water", "coffee_cups", "water_bottles")
+
+_CARBON_THRESHOLDS = (50,)
+_CARBON_PRIMARY = ("car_meters", "car_kilometers")
+
+
+# Conversion tables: name -> (divisor, multiplier, unit, icon, description template);
+# the converted value is base_value / divisor * multiplier
+_ENERGY_CONVERSIONS = {
+    "led_lightbulb": (1, 60, "minutes", "💡", "{:.1f} minutes of LED lightbulb (1W)"),  # 1Wh = 60 minutes of 1W bulb
+    "smartphone_charge": (10, 100, "percentage", "📱", "{:.1f}% of smartphone charge"),  # 10Wh = 100%
+    "coffee_cup": (40, 1, "cups", "☕", "{:.3f} cups of coffee"),  # 40Wh per cup
+    "laptop_runtime": (50, 60, "minutes", "💻", "{:.1f} minutes of laptop usage"),  # 50W laptop
+    "tv_runtime": (130, 60, "minutes", "📺", "{:.1f} minutes of 65\" TV")  # 130W TV
+}
+
+_WATER_CONVERSIONS = {
+    "water_drops": (1, 20, "drops", "💧", "{:.0f} drops of water"),  # 1mL ≈ 20 drops
+    "coffee_cups": (250, 1, "cups", "☕", "{:.3f} coffee cups"),  # 250mL per cup
+    "water_bottles": (500, 1, "bottles", "🍶", "{:.3f} water bottles (500mL)"),  # 500mL bottles
+    "daily_drinking_water": (2000, 100, "percentage", "🚰", "{:.2f}% of daily drinking water"),  # 2L per day
+    "olympic_pool": (2_500_000_000, 100, "percentage", "🏊", "{:.6f}% of Olympic pool")  # 2.5M liters
+}
+
+_CARBON_CONVERSIONS = {
+    "car_meters": (200, 1000, "meters", "🚗", "{:.1f} meters driven by car"),  # 200gCO2e per km
+    "car_kilometers": (200, 1, "kilometers", "🚗", "{:.3f} km driven by car"),  # 200gCO2e per km
+    "tree_absorption_daily": (48, 1, "trees (daily)", "🌳", "{:.3f} trees needed for 1 day"),  # 48gCO2e per tree per day
+    "forest_area": (10, 1, "square meters (yearly)", "🌲", "{:.2f} m² of forest for 1 year"),  # 10gCO2e per m² per year
+    "transatlantic_flight": (700_000, 100, "percentage", "✈️", "{:.4f}% of transatlantic flight")  # 700kg per flight
+}
+
+
+def _describe(conversions: Dict, name: str, value: float) -> str:
+    """Format the description of a single conversion."""
+    divisor, multiplier, _, _, template = conversions[name]
+    return template.format(value / divisor * multiplier)
+
+
+def _build_conversions(table: Dict, value: float) -> Dict:
+    """Build every conversion entry in a table for a single value."""
+    conversions = {}
+    for name, (divisor, multiplier, unit, icon, template) in table.items():
+        converted = value / divisor * multiplier
+        conversions[name] = {
+            "value": converted,
+            "unit": unit,
+            "description": template.format(converted),
+            "icon": icon
+        }
+    return conversions
+
+
+def _batch_conversions(table: Dict, values: Iterable[float], pick_primary) -> Dict[str, List]:
+    """Convert many values through a table, returning one list per conversion."""
+    # Every conversion walks the values, so one-shot iterables are read once up front
+    values = list(values)
+    batch = {
+        name: [v / divisor * multiplier for v in values]
+        for name, (divisor, multiplier, _, _, _) in table.items()
+    }
+    batch["primary"] = [pick_primary(v) for v in values]
+    return batch
+
+
+def _energy_primary(energy_wh: float) -> str:
+    """Pick the most relatable energy comparison for a value."""
+    return _ENERGY_PRIMARY[bisect_right(_ENERGY_THRESHOLDS, energy_wh)]
+
+
+def _water_primary(water_ml: float) -> str:
+    """Pick the most relatable water comparison for a value."""
+    return _WATER_PRIMARY[bisect_right(_WATER_THRESHOLDS, water_ml)]
+
+
+def _carbon_primary(carbon_gco2e: float) -> str:
+    """Pick the most relatable carbon comparison for a value."""
+    return _CARBON_PRIMARY[bisect_right(_CARBON_THRESHOLDS, carbon_gco2e)]
 
 
 class ConversionCalculator:
+    __slots__ = ("data_dir", "_conversion_factors_path", "conversion_factors")
+
     def __init__(self, data_dir: str = "../data"):
         """Initialize the conversion calculator."""
         self.data_dir = Path(data_dir)
+        self._conversion_factors_path = str((self.data_dir / "conversion_factors.json").resolve())
         self.conversion_factors = self._load_conversion_factors()
 
     def _load_conversion_factors(self) -> Dict:
-        """Load conversion factors from JSON."""
-        with open(self.data_dir / "conversion_factors.json", "r") as f:
-            return json.load(f)
+        """Load conversion factors from JSON (cached per resolved path)."""
+        return load_json(self._conversion_factors_path)
 
     def convert_energy(self, energy_wh: float, top_n: int = 3) -> Dict:
         """
@@ -30,63 +137,10 @@ class ConversionCalculator:
         Returns:
             Dictionary with conversions and primary comparison
         """
-        conversions = {}
-        energy_factors = self.conversion_factors["energy_conversions"]
-
-        # LED lightbulb (minutes)
-        led_minutes = energy_wh * 60  # 1Wh = 60 minutes of 1W bulb
-        conversions["led_lightbulb"] = {
-            "value": led_minutes,
-            "unit": "minutes",
-            "description": f"{led_minutes:.1f} minutes of LED lightbulb (1W)",
-            "icon": "💡"
-        }
-
-        # Smartphone charge (percentage)
-        smartphone_pct = (energy_wh / 10) * 100  # 10Wh = 100%
-        conversions["smartphone_charge"] = {
-            "value": smartphone_pct,
-            "unit": "percentage",
-            "description": f"{smartphone_pct:.1f}% of smartphone charge",
-            "icon": "📱"
-        }
-
-        # Coffee cup
-        coffee_cups = energy_wh / 40  # 40Wh per cup
-        conversions["coffee_cup"] = {
-            "value": coffee_cups,
-            "unit": "cups",
-            "description": f"{coffee_cups:.3f} cups of coffee",
-            "icon": "☕"
-        }
-
-        # Laptop runtime (minutes)
-        laptop_minutes = (energy_wh / 50) * 60  # 50W laptop
-        conversions["laptop_runtime"] = {
-            "value": laptop_minutes,
-            "unit": "minutes",
-            "description": f"{laptop_minutes:.1f} minutes of laptop usage",
-            "icon": "💻"
-        }
-
-        # TV runtime (minutes)
-        tv_minutes = (energy_wh / 130) * 60  # 130W TV
-        conversions["tv_runtime"] = {
-            "value": tv_minutes,
-            "unit": "minutes",
-            "description": f"{tv_minutes:.1f} minutes of 65\" TV",
-            "icon": "📺"
-        }
+        conversions = _build_conversions(_ENERGY_CONVERSIONS, energy_wh)
 
         # Determine primary comparison (most relatable)
-        if energy_wh < 1:
-            primary = "led_lightbulb"
-        elif energy_wh < 5:
-            primary = "smartphone_charge"
-        elif energy_wh < 20:
-            primary = "laptop_runtime"
-        else:
-            primary = "coffee_cup"
+        primary = _energy_primary(energy_wh)
 
         return {
             "conversions": conversions,
@@ -105,62 +159,10 @@ class ConversionCalculator:
         Returns:
             Dictionary with conversions and primary comparison
         """
-        conversions = {}
-
-        # Water drops (approximately 20 drops per mL)
-        drops = water_ml * 20  # 1mL ≈ 20 drops (medical/standard dropper)
-        conversions["water_drops"] = {
-            "value": drops,
-            "unit": "drops",
-            "description": f"{drops:.0f} drops of water",
-            "icon": "💧"
-        }
-
-        # Coffee cups
-        coffee_cups = water_ml / 250  # 250mL per cup
-        conversions["coffee_cups"] = {
-            "value": coffee_cups,
-            "unit": "cups",
-            "description": f"{coffee_cups:.3f} coffee cups",
-            "icon": "☕"
-        }
-
-        # Water bottles
-        bottles = water_ml / 500  # 500mL bottles
-        conversions["water_bottles"] = {
-            "value": bottles,
-            "unit": "bottles",
-            "description": f"{bottles:.3f} water bottles (500mL)",
-            "icon": "🍶"
-        }
-
-        # Daily drinking water (percentage)
-        daily_pct = (water_ml / 2000) * 100  # 2L per day
-        conversions["daily_drinking_water"] = {
-            "value": daily_pct,
-            "unit": "percentage",
-            "description": f"{daily_pct:.2f}% of daily drinking water",
-            "icon": "🚰"
-        }
-
-        # Olympic pool (for large amounts)
-        pool_pct = (water_ml / 2_500_000_000) * 100  # 2.5M liters
-        conversions["olympic_pool"] = {
-            "value": pool_pct,
-            "unit": "percentage",
-            "description": f"{pool_pct:.6f}% of Olympic pool",
-            "icon": "🏊"
-        }
+        conversions = _build_conversions(_WATER_CONVERSIONS, water_ml)
 
-        # Determine primary comparison
-        if water_ml < 10:
-            primary = "water_drops"
-        elif water_ml < 100:
-            primary = "daily_drinking_water"
-        elif water_ml < 500:
-            primary = "coffee_cups"
-        else:
-            primary = "water_bottles"
+        # Determine primary comparison (most relatable)
+        primary = _water_primary(water_ml)
 
         return {
             "conversions": conversions,
@@ -179,65 +181,78 @@ class ConversionCalculator:
         Returns:
             Dictionary with conversions and primary comparison
         """
-        conversions = {}
-
-        # Car distance (meters)
-        car_meters = (carbon_gco2e / 200) * 1000  # 200gCO2e per km
-        conversions["car_meters"] = {
-            "value": car_meters,
-            "unit": "meters",
-            "description": f"{car_meters:.1f} meters driven by car",
-            "icon": "🚗"
-        }
+        conversions = _build_conversions(_CARBON_CONVERSIONS, carbon_gco2e)
 
-        # Car distance (kilometers)
-        car_km = carbon_gco2e / 200  # 200gCO2e per km
-        conversions["car_kilometers"] = {
-            "value": car_km,
-            "unit": "kilometers",
-            "description": f"{car_km:.3f} km driven by car",
-            "icon": "🚗"
-        }
+        # Determine primary comparison (most relatable)
+        primary = _carbon_primary(carbon_gco2e)
 
-        # Tree absorption (daily)
-        trees_daily = carbon_gco2e / 48  # 48gCO2e per tree per day
-        conversions["tree_absorption_daily"] = {
-            "value": trees_daily,
-            "unit": "trees (daily)",
-            "description": f"{trees_daily:.3f} trees needed for 1 day",
-            "icon": "🌳"
+        return {
+            "conversions": conversions,
+            "primary": primary,
+            "primary_description": conversions[primary]["description"]
         }
 
-        # Forest area (yearly)
-        forest_sqm = carbon_gco2e / 10  # 10gCO2e per m² per year
-        conversions["forest_area"] = {
-            "value": forest_sqm,
-            "unit": "square meters (yearly)",
-            "description": f"{forest_sqm:.2f} m² of forest for 1 year",
-            "icon": "🌲"
-        }
+    def convert_energy_batch(self, energy_wh: Iterable[float]) -> Dict[str, List]:
+        """
+        Convert many energy values (Wh) at once.
 
-        # Transatlantic flight (percentage)
-        flight_pct = (carbon_gco2e / 700_000) * 100  # 700kg per flight
-        conversions["transatlantic_flight"] = {
-            "value": flight_pct,
-            "unit": "percentage",
-            "description": f"{flight_pct:.4f}% of transatlantic flight",
-            "icon": "✈️"
-        }
+        Only raw values are computed; no per-value dicts or description
+        strings are built.
+
+        Args:
+            energy_wh: Energy values in watt-hours
+
+        Returns:
+            Dictionary mapping each conversion (and "primary") to a list with
+            one entry per input value
+        """
+        return _batch_conversions(_ENERGY_CONVERSIONS, energy_wh, _energy_primary)
+
+    def convert_water_batch(self, water_ml: Iterable[float]) -> Dict[str, List]:
+        """
+        Convert many water values (mL) at once.
+
+        Args:
+            water_ml: Water values in milliliters
+
+        Returns:
+            Dictionary mapping each conversion (and "primary") to a list with
+            one entry per input value
+        """
+        return _batch_conversions(_WATER_CONVERSIONS, water_ml, _water_primary)
+
+    def convert_carbon_batch(self, carbon_gco2e: Iterable[float]) -> Dict[str, List]:
+        """
+        Convert many carbon values (gCO2e) at once.
+
+        Args:
+            carbon_gco2e: Carbon values in grams CO2 equivalent
 
-        # Determine primary comparison
-        if carbon_gco2e < 1:
-            primary = "car_meters"
-        elif carbon_gco2e < 50:
-            primary = "car_meters"
-        else:
-            primary = "car_kilometers"
+        Returns:
+            Dictionary mapping each conversion (and "primary") to a list with
+            one entry per input value
+        """
+        return _batch_conversions(_CARBON_CONVERSIONS, carbon_gco2e, _carbon_primary)
+
+    def convert_all_summary(
+        self,
+        energy_wh: float,
+        water_ml: float,
+        carbon_gco2e: float
+    ) -> Dict[str, str]:
+        """
+        Describe only the primary comparison for each metric.
+
+        A fast path for callers that just need the summary: only the three
+        primary descriptions are computed and formatted.
 
+        Returns:
+            Dictionary with energy, water and carbon primary descriptions
+        """
         return {
-            "conversions": conversions,
-            "primary": primary,
-            "primary_description": conversions[primary]["description"]
+            "energy": _describe(_ENERGY_CONVERSIONS, _energy_primary(energy_wh), energy_wh),
+            "water": _describe(_WATER_CONVERSIONS, _water_primary(water_ml), water_ml),
+            "carbon": _describe(_CARBON_CONVERSIONS, _carbon_primary(carbon_gco2e), carbon_gco2e)
         }
 
     def convert_all(
@@ -252,14 +267,18 @@ class ConversionCalculator:
         Returns:
             Dictionary with all conversions organized by category
         """
+        energy = self.convert_energy(energy_wh)
+        water = self.convert_water(water_ml)
+        carbon = self.convert_carbon(carbon_gco2e)
+
         return {
-            "energy": self.convert_energy(energy_wh),
-            "water": self.convert_water(water_ml),
-            "carbon": self.convert_carbon(carbon_gco2e),
+            "energy": energy,
+            "water": water,
+            "carbon": carbon,
             "summary": {
-                "energy_primary": self.convert_energy(energy_wh)["primary_description"],
-                "water_primary": self.convert_water(water_ml)["primary_description"],
-                "carbon_primary": self.convert_carbon(carbon_gco2e)["primary_description"]
+                "energy_primary": energy["primary_description"],
+                "water_primary": water["primary_description"],
+                "carbon_primary": carbon["primary_description"]
             }
         }
 
@@ -275,20 +294,13 @@ class ConversionCalculator:
         Returns:
             Formatted string with all primary comparisons
         """
-        conversions = self.convert_all(energy_wh, water_ml, carbon_gco2e)
-
-        return f"""
-🌍 ENVIRONMENTAL IMPACT
-
-⚡ Energy: {energy_wh:.2f} Wh
-   = {conversions['energy']['primary_description']}
-
-💧 Water: {water_ml:.2f} mL
-   = {conversions['water']['primary_description']}
+        summary = self.convert_all_summary(energy_wh, water_ml, carbon_gco2e)
 
-🌱 Carbon: {carbon_gco2e:.2f} gCO2e
-   = {conversions['carbon']['primary_description']}
-        """.strip()
+        return _DISPLAY_TEMPLATE.format(
+            energy_wh, summary["energy"],
+            water_ml, summary["water"],
+            carbon_gco2e, summary["carbon"]
+        )
 
 
 # Example usage
@@ -5,46 +5,89 @@ Based on "How Hungry is AI?" paper methodology
 Formula: Equery (kWh) = [(Output_Length / TPS + Latency) / 3600] × [(PGPU × UGPU) + (Pnon-GPU × Unon-GPU)] × PUE
 """
 
-import json
+from collections import namedtuple
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
+try:
+    from ._data import PROVIDER_MAP, best_and_worst, load_json, provider_lookup_error
+except ImportError:  # run directly as a script (see example usage below)
+    from _data import PROVIDER_MAP, best_and_worst, load_json, provider_lookup_error
+
+
+# Prompt categories by total token count: <= 500 short, <= 2500 medium, else long
+_SHORT_MAX_TOKENS = 500
+_MEDIUM_MAX_TOKENS = 2500
+_PROMPT_CATEGORIES = ("short", "medium", "long")
+
+
+def _energy_kernel(output_tokens: int, latency: float, tps: float, power_kw: float, pue: float) -> float:
+    """
+    Core per-query energy arithmetic from the paper's formula.
+
+    Returns:
+        Energy in kWh
+    """
+    return ((latency + output_tokens / tps) / 3600) * power_kw * pue
+
+
+class _EnergyResult(namedtuple(
+    "_EnergyResult", "model_id model_name energy_wh energy_std provider size_class"
+)):
+    """Compact per-model record used while comparing models."""
+    __slots__ = ()
+
+    def to_dict(self) -> Dict:
+        """Convert to the comparison entry dict returned by compare_models."""
+        return {
+            "model_id": self.model_id,
+            "model_name": self.model_name,
+            "energy_wh": self.energy_wh,
+            "energy_kwh": self.energy_wh / 1000,
+            "confidence_interval": EnergyCalculator._benchmark_interval(self.energy_wh, self.energy_std),
+            "provider": self.provider,
+            "size_class": self.size_class
+        }
 
 
 class EnergyCalculator:
+    __slots__ = (
+        "data_dir", "_models_path", "_infrastructure_path",
+        "models", "infrastructure", "models_by_id", "model_to_provider"
+    )
+
     def __init__(self, data_dir: str = "../data"):
         """Initialize the energy calculator with model and infrastructure data."""
         self.data_dir = Path(data_dir)
+        # Resolved string paths double as cheap, stable load_json cache keys
+        self._models_path = str((self.data_dir / "model_benchmarks.json").resolve())
+        self._infrastructure_path = str((self.data_dir / "infrastructure.json").resolve())
         self.models = self._load_models()
         self.infrastructure = self._load_infrastructure()
+        self.models_by_id = {m["model_id"]: m for m in self.models["models"]}
+        # Resolve each model's host to its provider multipliers once at load time;
+        # models without a provider block are left out and fail on lookup
+        providers = self.infrastructure["providers"]
+        self.model_to_provider = {
+            model_id: providers[PROVIDER_MAP[m["host"]]]
+            for model_id, m in self.models_by_id.items()
+            if m["host"] in PROVIDER_MAP and PROVIDER_MAP[m["host"]] in providers
+        }
 
     def _load_models(self) -> Dict:
-        """Load model benchmarks from JSON."""
-        with open(self.data_dir / "model_benchmarks.json", "r") as f:
-            return json.load(f)
+        """Load model benchmarks from JSON (cached per resolved path)."""
+        return load_json(self._models_path)
 
     def _load_infrastructure(self) -> Dict:
-        """Load infrastructure multipliers from JSON."""
-        with open(self.data_dir / "infrastructure.json", "r") as f:
-            return json.load(f)
+        """Load infrastructure multipliers from JSON (cached per resolved path)."""
+        return load_json(self._infrastructure_path)
 
     def _get_provider_multipliers(self, model_id: str) -> Dict:
         """Get PUE, WUE, CIF multipliers for a model's provider."""
-        model = next((m for m in self.models["models"] if m["model_id"] == model_id), None)
-        if not model:
-            raise ValueError(f"Model {model_id} not found")
-
-        provider_map = {
-            "Microsoft Azure": "microsoft_azure",
-            "AWS": "aws",
-            "DeepSeek": "deepseek",
-            "Google Cloud": "google_cloud"
-        }
-
-        provider_key = provider_map.get(model["host"])
-        if not provider_key:
-            raise ValueError(f"Unknown provider: {model['host']}")
-
-        return self.infrastructure["providers"][provider_key]
+        provider = self.model_to_provider.get(model_id)
+        if provider is None:
+            raise ValueError(provider_lookup_error(self.models_by_id, model_id))
+        return provider
 
     def _determine_prompt_category(self, input_tokens: int, output_tokens: int) -> str:
         """
@@ -56,13 +99,7 @@ class EnergyCalculator:
         - Long: 10000 input, 1500 output
         """
         total_tokens = input_tokens + output_tokens
-
-        if total_tokens <= 500:
-            return "short"
-        elif total_tokens <= 2500:
-            return "medium"
-        else:
-            return "long"
+        return _PROMPT_CATEGORIES[(total_tokens > _SHORT_MAX_TOKENS) + (total_tokens > _MEDIUM_MAX_TOKENS)]
 
     def calculate_energy(
         self,
@@ -83,7 +120,7 @@ class EnergyCalculator:
         Returns:
             Dictionary with energy metrics and confidence intervals
         """
-        model = next((m for m in self.models["models"] if m["model_id"] == model_id), None)
+        model = self.models_by_id.get(model_id)
         if not model:
             raise ValueError(f"Model {model_id} not found")
 
@@ -98,11 +135,7 @@ class EnergyCalculator:
             return {
                 "energy_wh": energy_wh,
                 "energy_kwh": energy_wh / 1000,
-                "confidence_interval": {
-                    "min_wh": max(0, energy_wh - energy_std),
-                    "max_wh": energy_wh + energy_std,
-                    "std_dev": energy_std
-                },
+                "confidence_interval": self._benchmark_interval(energy_wh, energy_std),
                 "prompt_category": category,
                 "method": "benchmark"
             }
@@ -110,6 +143,15 @@ class EnergyCalculator:
             # Calculate from formula (for custom token counts)
             return self._calculate_from_formula(model, input_tokens, output_tokens, category)
 
+    @staticmethod
+    def _benchmark_interval(energy_wh: float, energy_std: float) -> Dict:
+        """Build the ±1 std dev confidence interval for a benchmark mean."""
+        return {
+            "min_wh": max(0, energy_wh - energy_std),
+            "max_wh": energy_wh + energy_std,
+            "std_dev": energy_std
+        }
+
     def _calculate_from_formula(
         self,
         model: Dict,
@@ -132,17 +174,16 @@ class EnergyCalculator:
         pgpu = model["critical_power_kw"]  # Total node power in kW
         pue = provider["pue"]
 
-        # Calculate inference time
+        # Calculate inference time (reported in details)
         output_time = output_tokens / tps  # seconds to generate output
         total_time = latency + output_time  # total time in seconds
-        total_time_hours = total_time / 3600  # convert to hours
 
         # Simplified power calculation (using full node power as approximation)
         # In production, you'd use UGPU and Unon-GPU from infrastructure.json
         power_kw = pgpu
 
         # Calculate energy
-        energy_kwh = total_time_hours * power_kw * pue
+        energy_kwh = _energy_kernel(output_tokens, latency, tps, power_kw, pue)
         energy_wh = energy_kwh * 1000
 
         # Estimate uncertainty (±25% as approximation)
@@ -168,6 +209,62 @@ class EnergyCalculator:
             }
         }
 
+    def calculate_energy_batch(
+        self,
+        model_id: str,
+        input_tokens: Iterable[int],
+        output_tokens: Iterable[int],
+        use_benchmark: bool = True
+    ) -> Dict[str, List]:
+        """
+        Calculate energy for many queries against one model.
+
+        Model parameters are resolved once and the per-query arithmetic runs
+        over the token lists.
+
+        Args:
+            model_id: Model identifier (e.g., "gpt-4o")
+            input_tokens: Input token counts, one per query
+            output_tokens: Output token counts, one per query
+            use_benchmark: If True, use pre-calculated benchmarks; if False, calculate from scratch
+
+        Returns:
+            Dictionary with energy_wh, energy_kwh and prompt_category lists
+        """
+        # Both lists are walked more than once, so one-shot iterables are read up front
+        input_tokens = list(input_tokens)
+        output_tokens = list(output_tokens)
+        if len(input_tokens) != len(output_tokens):
+            raise ValueError("input_tokens and output_tokens must have the same length")
+
+        model = self.models_by_id.get(model_id)
+        if not model:
+            raise ValueError(f"Model {model_id} not found")
+
+        performance = model["performance"]
+        categories = [
+            _PROMPT_CATEGORIES[(t > _SHORT_MAX_TOKENS) + (t > _MEDIUM_MAX_TOKENS)]
+            for t in (i + o for i, o in zip(input_tokens, output_tokens))
+        ]
+
+        if use_benchmark:
+            energy_wh = [performance[c]["energy_wh_mean"] for c in categories]
+            energy_kwh = [e / 1000 for e in energy_wh]
+        else:
+            power_kw = model["critical_power_kw"]
+            pue = self._get_provider_multipliers(model_id)["pue"]
+            energy_kwh = [
+                _energy_kernel(o, performance[c]["latency_p50"], performance[c]["tps_p50"], power_kw, pue)
+                for o, c in zip(output_tokens, categories)
+            ]
+            energy_wh = [e * 1000 for e in energy_kwh]
+
+        return {
+            "energy_wh": energy_wh,
+            "energy_kwh": energy_kwh,
+            "prompt_category": categories
+        }
+
     def estimate_tokens(self, text: str) -> int:
         """
         Estimate token count from text.
@@ -187,43 +284,49 @@ class EnergyCalculator:
         Returns:
             Dictionary with comparison data and recommendation
         """
-        results = []
+        results = [None] * len(model_ids)
+        valid_results = []
 
-        for model_id in model_ids:
-            try:
-                energy_data = self.calculate_energy(model_id, input_tokens, output_tokens)
-                model = next((m for m in self.models["models"] if m["model_id"] == model_id), None)
+        # The prompt category depends only on token counts, so it is shared
+        # by every model and benchmarks can be read straight from the catalog
+        category = self._determine_prompt_category(input_tokens, output_tokens)
 
-                results.append({
-                    "model_id": model_id,
-                    "model_name": model["name"],
-                    "energy_wh": energy_data["energy_wh"],
-                    "energy_kwh": energy_data["energy_kwh"],
-                    "confidence_interval": energy_data["confidence_interval"],
-                    "provider": model["provider"],
-                    "size_class": model["size_class"]
-                })
-            except Exception as e:
-                results.append({
+        for i, model_id in enumerate(model_ids):
+            model = self.models_by_id.get(model_id)
+            if not model:
+                results[i] = {
                     "model_id": model_id,
-                    "error": str(e)
-                })
+                    "error": f"Model {model_id} not found"
+                }
+                continue
+
+            perf = model["performance"][category]
+            results[i] = record = _EnergyResult(
+                model_id,
+                model["name"],
+                perf["energy_wh_mean"],
+                perf["energy_wh_std"],
+                model["provider"],
+                model["size_class"]
+            )
+            valid_results.append(record)
+
+        comparison = [r.to_dict() if isinstance(r, _EnergyResult) else r for r in results]
 
         # Find most efficient model
-        valid_results = [r for r in results if "error" not in r]
         if valid_results:
-            most_efficient = min(valid_results, key=lambda x: x["energy_wh"])
+            most_efficient, best, worst = best_and_worst(valid_results, attrgetter("energy_wh"))
 
             return {
-                "comparison": results,
-                "recommendation": most_efficient["model_id"],
+                "comparison": comparison,
+                "recommendation": most_efficient.model_id,
                 "savings": {
-                    "best_energy_wh": most_efficient["energy_wh"],
-                    "worst_energy_wh": max(valid_results, key=lambda x: x["energy_wh"])["energy_wh"]
+                    "best_energy_wh": best,
+                    "worst_energy_wh": worst
                 }
             }
 
-        return {"comparison": results, "recommendation": None}
+        return {"comparison": comparison, "recommendation": None}
 
 
 # Example usage
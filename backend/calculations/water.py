@@ -5,42 +5,78 @@ Based on "How Hungry is AI?" paper methodology
 Formula: Water (L) = (Equery / PUE) × WUEsite + Equery × WUEsource
 """
 
-import json
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple
+from ._data import PROVIDER_MAP, best_and_worst, provider_lookup_error
 from .energy import EnergyCalculator
 
 
+def _water_kernel(
+    energy_kwh: float,
+    onsite_factor: float,
+    wue_offsite: float,
+    wue_total: float
+) -> Tuple[float, float, float]:
+    """
+    Core per-query water arithmetic using precomputed provider factors.
+
+    Returns:
+        Tuple of (total, onsite, offsite) water in liters
+    """
+    return energy_kwh * wue_total, energy_kwh * onsite_factor, energy_kwh * wue_offsite
+
+
 class WaterCalculator:
-    def __init__(self, data_dir: str = "../data"):
-        """Initialize the water calculator."""
-        self.data_dir = Path(data_dir)
-        self.energy_calculator = EnergyCalculator(data_dir)
-        self.infrastructure = self._load_infrastructure()
+    __slots__ = ("data_dir", "energy_calculator", "infrastructure", "_model_to_provider")
 
-    def _load_infrastructure(self) -> Dict:
-        """Load infrastructure multipliers from JSON."""
-        with open(self.data_dir / "infrastructure.json", "r") as f:
-            return json.load(f)
+    def __init__(self, data_dir: str = "../data", energy_calculator: EnergyCalculator = None):
+        """
+        Initialize the water calculator.
 
-    def _get_provider_multipliers(self, model_id: str) -> Dict:
-        """Get WUE and PUE multipliers for a model's provider."""
-        model = next((m for m in self.energy_calculator.models["models"] if m["model_id"] == model_id), None)
-        if not model:
-            raise ValueError(f"Model {model_id} not found")
-
-        provider_map = {
-            "Microsoft Azure": "microsoft_azure",
-            "AWS": "aws",
-            "DeepSeek": "deepseek",
-            "Google Cloud": "google_cloud"
+        Args:
+            data_dir: Directory containing the JSON data files
+            energy_calculator: Optional shared EnergyCalculator; its loaded
+                models and infrastructure data are reused instead of re-reading JSON
+        """
+        self.data_dir = Path(data_dir)
+        self.energy_calculator = energy_calculator or EnergyCalculator(data_dir)
+        self.infrastructure = self.energy_calculator.infrastructure
+        # Resolve each model's host to its provider multipliers once at load time,
+        # only for hosts that models actually use and that have a provider block
+        infrastructure_providers = self.infrastructure["providers"]
+        providers = {
+            host: self._with_water_factors(infrastructure_providers[PROVIDER_MAP[host]])
+            for host in {m["host"] for m in self.energy_calculator.models_by_id.values()}
+            if host in PROVIDER_MAP and PROVIDER_MAP[host] in infrastructure_providers
         }
+        self._model_to_provider = {
+            model_id: providers[m["host"]]
+            for model_id, m in self.energy_calculator.models_by_id.items()
+            if m["host"] in providers
+        }
+
+    @staticmethod
+    def _with_water_factors(provider: Dict) -> Dict:
+        """
+        Copy a provider's multipliers and add its per-kWh water factors.
 
-        provider_key = provider_map.get(model["host"])
-        if not provider_key:
-            raise ValueError(f"Unknown provider: {model['host']}")
+        (Equery / PUE) × WUEsite + Equery × WUEsource collapses to
+        Equery × (WUEsite / PUE + WUEsource), so both terms are constant per provider.
+        """
+        onsite_factor = provider["wue_onsite_l_per_kwh"] / provider["pue"]
+        return {
+            **provider,
+            "onsite_factor": onsite_factor,
+            "wue_total_l_per_kwh": onsite_factor + provider["wue_offsite_l_per_kwh"]
+        }
 
-        return self.infrastructure["providers"][provider_key]
+    def _get_provider_multipliers(self, model_id: str) -> Dict:
+        """Get WUE and PUE multipliers for a model's provider."""
+        provider = self._model_to_provider.get(model_id)
+        if provider is None:
+            raise ValueError(provider_lookup_error(self.energy_calculator.models_by_id, model_id))
+        return provider
 
     def calculate_water(
         self,
@@ -84,15 +120,13 @@ class WaterCalculator:
         wue_onsite = provider["wue_onsite_l_per_kwh"]
         wue_offsite = provider["wue_offsite_l_per_kwh"]
 
-        # Calculate water consumption
-        # On-site cooling
-        water_onsite_l = (energy_kwh / pue) * wue_onsite
-
-        # Off-site electricity generation
-        water_offsite_l = energy_kwh * wue_offsite
-
-        # Total water
-        water_total_l = water_onsite_l + water_offsite_l
+        # Calculate water consumption (on-site cooling + off-site electricity generation)
+        water_total_l, water_onsite_l, water_offsite_l = _water_kernel(
+            energy_kwh,
+            provider["onsite_factor"],
+            wue_offsite,
+            provider["wue_total_l_per_kwh"]
+        )
         water_total_ml = water_total_l * 1000
 
         return {
@@ -128,37 +162,40 @@ class WaterCalculator:
             Dictionary with comparison data and recommendation
         """
         results = []
+        models_by_id = self.energy_calculator.models_by_id
 
         for model_id in model_ids:
-            try:
-                water_data = self.calculate_water(model_id, input_tokens, output_tokens)
-                model = next((m for m in self.energy_calculator.models["models"] if m["model_id"] == model_id), None)
-
-                results.append({
-                    "model_id": model_id,
-                    "model_name": model["name"],
-                    "water_ml": water_data["water_ml"],
-                    "water_l": water_data["water_l"],
-                    "breakdown": water_data["breakdown"],
-                    "provider": model["provider"]
-                })
-            except Exception as e:
+            # Unknown models and providers are reported in place rather than raised
+            if model_id not in self._model_to_provider:
                 results.append({
                     "model_id": model_id,
-                    "error": str(e)
+                    "error": provider_lookup_error(models_by_id, model_id)
                 })
+                continue
+
+            model = models_by_id[model_id]
+            water_data = self.calculate_water(model_id, input_tokens, output_tokens)
+
+            results.append({
+                "model_id": model_id,
+                "model_name": model["name"],
+                "water_ml": water_data["water_ml"],
+                "water_l": water_data["water_l"],
+                "breakdown": water_data["breakdown"],
+                "provider": model["provider"]
+            })
 
         # Find most efficient model
         valid_results = [r for r in results if "error" not in r]
         if valid_results:
-            most_efficient = min(valid_results, key=lambda x: x["water_ml"])
+            most_efficient, best, worst = best_and_worst(valid_results, itemgetter("water_ml"))
 
             return {
                 "comparison": results,
                 "recommendation": most_efficient["model_id"],
                 "savings": {
-                    "best_water_ml": most_efficient["water_ml"],
-                    "worst_water_ml": max(valid_results, key=lambda x: x["water_ml"])["water_ml"]
+                    "best_water_ml": best,
+                    "worst_water_ml": worst
                 }
             }
 
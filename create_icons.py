@@ -4,8 +4,10 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
 
-def create_icon(size, filename):
-    """Create a simple icon with the size specified."""
+MASTER_SIZE = 256
+
+def create_master_icon(size=MASTER_SIZE):
+    """Draw the icon once at a large size; smaller icons are resized from it."""
     # Create a new image with a green background (eco theme)
     img = Image.new('RGB', (size, size), color='#2ecc71')
     draw = ImageDraw.Draw(img)
@@ -22,8 +24,11 @@ def create_icon(size, filename):
                   center + leaf_size//2, center + leaf_size//2],
                  fill='#2ecc71', outline='#27ae60', width=max(1, size//32))
 
-    # Save the icon
-    img.save(filename, 'PNG')
+    return img
+
+def create_icon(master, size, filename):
+    """Save the master icon downscaled to the size specified."""
+    master.resize((size, size), Image.LANCZOS).save(filename, 'PNG', optimize=True)
     print(f"Created {filename}")
 
 # Create icons in the assets folder
@@ -31,9 +36,10 @@ assets_dir = 'assets'
 if not os.path.exists(assets_dir):
     os.makedirs(assets_dir)
 
-# Create icons for different sizes
-create_icon(16, os.path.join(assets_dir, 'icon16.png'))
-create_icon(48, os.path.join(assets_dir, 'icon48.png'))
-create_icon(128, os.path.join(assets_dir, 'icon128.png'))
+# Create icons for different sizes from a single master drawing
+master = create_master_icon()
+create_icon(master, 16, os.path.join(assets_dir, 'icon16.png'))
+create_icon(master, 48, os.path.join(assets_dir, 'icon48.png'))
+create_icon(master, 128, os.path.join(assets_dir, 'icon128.png'))
 
 print("All icons created successfully!")